@@ -4,15 +4,161 @@ import os
 import platform
 import json
 import shutil
+import sqlite3
 import subprocess
+import time
 import requests
 from zipfile import ZipFile
 from io import BytesIO
 import webbrowser
 import sys
 from pathlib import Path
+from datetime import datetime
+
+INDEX_PATH = os.path.join(os.path.expanduser("~"), ".github_compiler", "projects.db")
+
+class ProjectIndex:
+    """Index local (SQLite) de tous les dépôts traités par l'application."""
+
+    def __init__(self, db_path=INDEX_PATH):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS projects (
+                    path TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    url TEXT,
+                    ref TEXT,
+                    commit_sha TEXT,
+                    type TEXT,
+                    compile_method TEXT,
+                    main_executable TEXT,
+                    toolchain TEXT,
+                    built_commit TEXT,
+                    build_status TEXT,
+                    build_duration REAL,
+                    artifact_path TEXT,
+                    downloaded_at TEXT,
+                    analyzed_at TEXT,
+                    built_at TEXT
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_projects_type ON projects(type)")
+
+    def _now(self):
+        return datetime.now().isoformat(timespec="seconds")
+
+    def _key(self, path):
+        # Normaliser le chemin pour qu'un même dossier corresponde toujours à une seule ligne
+        return os.path.realpath(os.path.expanduser(path))
+
+    def record_download(self, path, name, url, ref, commit_sha):
+        """Enregistre l'étape de téléchargement (ref et commit récupérés).
+
+        Un nouveau téléchargement remplace le contenu du dossier : les
+        informations de compilation précédentes sont donc effacées.
+        """
+        with self.conn:
+            self.conn.execute("""
+                INSERT INTO projects (path, name, url, ref, commit_sha, downloaded_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    name = excluded.name,
+                    url = excluded.url,
+                    ref = excluded.ref,
+                    commit_sha = excluded.commit_sha,
+                    downloaded_at = excluded.downloaded_at,
+                    built_commit = NULL,
+                    build_status = NULL,
+                    build_duration = NULL,
+                    artifact_path = NULL,
+                    built_at = NULL
+            """, (self._key(path), name, url, ref, commit_sha, self._now()))
+
+    def record_analysis(self, path, name, project_type, compile_method, main_executable, toolchain):
+        """Enregistre le résultat de l'analyse (type, exécutable, versions des outils)."""
+        with self.conn:
+            self.conn.execute("""
+                INSERT INTO projects (path, name, type, compile_method, main_executable,
+                                      toolchain, analyzed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    name = excluded.name,
+                    type = excluded.type,
+                    compile_method = excluded.compile_method,
+                    main_executable = excluded.main_executable,
+                    toolchain = excluded.toolchain,
+                    analyzed_at = excluded.analyzed_at
+            """, (self._key(path), name, project_type, compile_method, main_executable,
+                  json.dumps(toolchain, ensure_ascii=False), self._now()))
+
+    def record_build(self, path, name, status, duration, artifact_path):
+        """Enregistre le résultat d'une compilation (statut, durée, artefact)."""
+        with self.conn:
+            self.conn.execute("""
+                INSERT INTO projects (path, name, build_status, build_duration,
+                                      artifact_path, built_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    built_commit = projects.commit_sha,
+                    build_status = excluded.build_status,
+                    build_duration = excluded.build_duration,
+                    artifact_path = excluded.artifact_path,
+                    built_at = excluded.built_at
+            """, (self._key(path), name, status, duration, artifact_path, self._now()))
+
+    def remove(self, path):
+        """Supprime un projet de l'index (dossier effacé du disque)."""
+        with self.conn:
+            self.conn.execute("DELETE FROM projects WHERE path = ?", (self._key(path),))
+
+    def get(self, path):
+        row = self.conn.execute("SELECT * FROM projects WHERE path = ?",
+                                (self._key(path),)).fetchone()
+        return dict(row) if row else None
+
+    def projects_by_type(self, project_type):
+        """Retourne les projets d'un type donné (ex. "CMake")."""
+        rows = self.conn.execute("SELECT * FROM projects WHERE type = ? ORDER BY name",
+                                 (project_type,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def needs_rebuild(self):
+        """Retourne les projets jamais compilés, en échec, dont le commit a changé
+        ou dont l'artefact n'existe plus sur le disque."""
+        rows = self.conn.execute("""
+            SELECT *,
+                   (build_status IS NULL
+                    OR build_status != 'success'
+                    OR built_commit IS NOT commit_sha) AS stale
+            FROM projects
+            ORDER BY name
+        """).fetchall()
+        result = []
+        for row in rows:
+            project = dict(row)
+            stale = project.pop("stale")
+            artifact = project["artifact_path"]
+            if stale or (artifact and not os.path.exists(artifact)):
+                result.append(project)
+        return result
+
+    def close(self):
+        self.conn.close()
 
 class GitHubCompilerApp:
+    # Outils nécessaires en fonction du type de projet
+    TOOLS_NEEDED = {
+        "CMake": ["cmake"],
+        "Make": ["make"],
+        "Python": ["python"],
+        "Node.js": ["node"],
+        "Java": ["java"],
+        "Executable": []
+    }
+
     def __init__(self, root):
         self.root = root
         self.root.title("GitHub Project Compiler")
@@ -23,10 +169,19 @@ class GitHubCompilerApp:
         self.output_dir = tk.StringVar(value=os.path.expanduser("~/Downloads"))
         self.project_info = None
         self.skip_installation = False
+        self.index = None
 
         # Interface
         self.create_widgets()
 
+        # L'index n'est qu'un complément : l'application reste utilisable sans lui
+        try:
+            self.index = ProjectIndex()
+        except (sqlite3.Error, OSError) as e:
+            self.log(f"Index des projets indisponible : {str(e)}")
+
+        self.root.protocol("WM_DELETE_WINDOW", self.close_app)
+
     def create_widgets(self):
         # URL input
         url_frame = ttk.LabelFrame(self.root, text="GitHub Repository", padding="10")
@@ -48,6 +203,8 @@ class GitHubCompilerApp:
 
         ttk.Button(button_frame, text="Download & Install",
                    command=self.process_project).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Index des projets",
+                   command=self.show_index_dialog).pack(side="left", padx=5)
 
         # Log area
         log_frame = ttk.LabelFrame(self.root, text="Logs", padding="10")
@@ -56,6 +213,53 @@ class GitHubCompilerApp:
         self.log_text = tk.Text(log_frame, height=10)
         self.log_text.pack(fill="both", expand=True)
 
+    def show_index_dialog(self):
+        """Affiche les projets indexés : à recompiler ou filtrés par type."""
+        if not self.index:
+            messagebox.showwarning("Attention", "Index des projets indisponible")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Index des projets")
+        dialog.geometry("700x350")
+
+        filter_frame = ttk.Frame(dialog, padding="10")
+        filter_frame.pack(fill="x")
+
+        project_type = tk.StringVar(value="CMake")
+        types = list(self.TOOLS_NEEDED) + ["Script/Executable", "Unknown"]
+        ttk.Combobox(filter_frame, textvariable=project_type, values=types,
+                     state="readonly", width=20).pack(side="left", padx=5)
+
+        columns = ("name", "type", "build_status", "path")
+        tree = ttk.Treeview(dialog, columns=columns, show="headings")
+        for column, title in zip(columns, ("Projet", "Type", "Compilation", "Dossier")):
+            tree.heading(column, text=title)
+        tree.column("path", width=300)
+        tree.pack(fill="both", expand=True, padx=10, pady=5)
+
+        def show(query, *args):
+            projects = self.update_index(query, *args) or []
+            tree.delete(*tree.get_children())
+            for project in projects:
+                tree.insert("", "end", values=(project["name"], project["type"] or "",
+                                               project["build_status"] or "", project["path"]))
+
+        ttk.Button(filter_frame, text="Par type",
+                   command=lambda: show("projects_by_type", project_type.get())).pack(side="left", padx=5)
+        ttk.Button(filter_frame, text="À recompiler",
+                   command=lambda: show("needs_rebuild")).pack(side="left", padx=5)
+
+        show("needs_rebuild")
+        dialog.transient(self.root)
+
+    def close_app(self):
+        """Ferme l'index des projets puis l'application."""
+        if self.index:
+            self.update_index("close")
+            self.index = None
+        self.root.destroy()
+
     def browse_directory(self):
         directory = filedialog.askdirectory()
         if directory:
@@ -66,6 +270,16 @@ class GitHubCompilerApp:
         self.log_text.see("end")
         self.root.update()
 
+    def update_index(self, method_name, *args):
+        """Met à jour l'index des projets sans interrompre le traitement en cas d'erreur."""
+        if not self.index:
+            return None
+        try:
+            return getattr(self.index, method_name)(*args)
+        except sqlite3.Error as e:
+            self.log(f"Erreur de l'index des projets : {str(e)}")
+            return None
+
     def handle_output_directory(self, output_path):
         """Gère la création et la vérification du dossier de sortie."""
         try:
@@ -104,11 +318,39 @@ class GitHubCompilerApp:
 
     def check_tool_installed(self, tool):
         """Vérifie si un outil est installé sur le système."""
+        return self.get_tool_version(tool) is not None
+
+    def get_tool_version(self, tool):
+        """Retourne la première ligne de `tool --version`, ou None si l'outil est absent."""
         try:
-            subprocess.run([tool, "--version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            return True
+            result = subprocess.run([tool, "--version"], check=True, stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT, text=True)
+            lines = result.stdout.strip().splitlines()
+            return lines[0] if lines else ""
         except Exception:
-            return False
+            return None
+
+    def get_toolchain(self, project_path, compile_method):
+        """Retourne les versions des outils réellement utilisés par la méthode de compilation."""
+        if compile_method in ("compile_cmake_project", "compile_make_project"):
+            tools = {"cmake": "cmake"} if compile_method == "compile_cmake_project" else {"make": "make"}
+            tools.update({"cc": "cc", "c++": "c++"})
+        elif compile_method == "compile_python_project":
+            tools = {"python": sys.executable}
+            if platform.system() == "Windows":
+                tools["pyinstaller"] = "pyinstaller"
+        elif compile_method == "compile_node_project":
+            tools = {"node": "node", "npm": "npm"}
+        elif compile_method == "compile_java_project":
+            tools = {"java": "java"}
+            if os.path.exists(os.path.join(project_path, "pom.xml")):
+                tools["mvn"] = "mvn"
+            elif os.path.exists(os.path.join(project_path, "build.gradle")):
+                tools["gradle"] = "gradle"
+        else:
+            tools = {}
+
+        return {name: self.get_tool_version(command) for name, command in tools.items()}
 
     def show_missing_programs_dialog(self, project_type):
         """Affiche une boîte de dialogue pour les programmes manquants."""
@@ -119,15 +361,7 @@ class GitHubCompilerApp:
         message = f"Ce projet nécessite l'installation de dépendances pour {project_type}.\n\n"
         message += "Veuillez vérifier les outils nécessaires :\n"
 
-        # Définir les outils nécessaires en fonction du type de projet
-        tools_needed = {
-            "CMake": ["cmake"],
-            "Make": ["make"],
-            "Python": ["python"],
-            "Node.js": ["node"],
-            "Java": ["java"],
-            "Executable": []
-        }
+        tools_needed = self.TOOLS_NEEDED
 
         frame = ttk.Frame(dialog)
         frame.pack(padx=10, pady=10, fill="both", expand=True)
@@ -190,7 +424,7 @@ class GitHubCompilerApp:
         self.skip_installation = True
         self.open_project_folder()
         self.generate_tree_file()
-        self.root.destroy()
+        self.close_app()
 
     def cancel_process(self):
         if self.project_info and 'path' in self.project_info:
@@ -198,7 +432,8 @@ class GitHubCompilerApp:
             if os.path.exists(project_path):
                 shutil.rmtree(project_path)
                 self.log(f"Contenu téléchargé supprimé : {project_path}")
-        self.root.destroy()
+            self.update_index("remove", project_path)
+        self.close_app()
 
     def open_project_folder(self):
         """Ouvre le dossier du projet dans l'explorateur de fichiers."""
@@ -267,21 +502,18 @@ class GitHubCompilerApp:
             owner = parts[-2]
             repo = parts[-1]
 
-            # Construire les URLs de téléchargement pour main et master
-            urls_to_try = [
-                f"https://github.com/{owner}/{repo}/archive/refs/heads/main.zip",
-                f"https://github.com/{owner}/{repo}/archive/refs/heads/master.zip"
-            ]
-
             self.log(f"Téléchargement du dépôt vers {output_path}...")
 
             # Essayer de télécharger depuis main ou master
             success = False
-            for download_url in urls_to_try:
+            for ref in ["main", "master"]:
+                download_url = f"https://github.com/{owner}/{repo}/archive/refs/heads/{ref}.zip"
                 response = requests.get(download_url)
                 if response.status_code == 200:
                     with ZipFile(BytesIO(response.content)) as zip_file:
                         zip_file.extractall(output_path)
+                        # GitHub stocke le SHA du commit dans le commentaire de l'archive
+                        commit_sha = zip_file.comment.decode("ascii", errors="ignore").strip() or None
                     success = True
                     break
 
@@ -300,6 +532,7 @@ class GitHubCompilerApp:
                     )
                 shutil.rmtree(extracted_path)
 
+            self.update_index("record_download", output_path, repo, url, ref, commit_sha)
             self.log("Dépôt téléchargé avec succès")
             self.analyze_project(output_path, repo)
 
@@ -356,6 +589,11 @@ class GitHubCompilerApp:
 
         self.log(f"Type de projet détecté : {self.project_info['type']}")
 
+        # Mettre à jour l'index avec le type détecté et les versions des outils
+        toolchain = self.get_toolchain(project_path, self.project_info['compile_method'])
+        self.update_index("record_analysis", project_path, repo_name, self.project_info['type'],
+                          self.project_info['compile_method'], main_executable, toolchain)
+
         # Sauvegarder les informations du projet
         with open(os.path.join(project_path, ".compiler_info.json"), "w", encoding='utf-8') as f:
             json.dump(self.project_info, f, default=str, ensure_ascii=False, indent=2)
@@ -371,20 +609,32 @@ class GitHubCompilerApp:
         project_path = self.project_info['path']
         compile_method = self.project_info.get('compile_method')
 
-        if compile_method == "compile_cmake_project":
-            self.compile_cmake_project(project_path)
-        elif compile_method == "compile_make_project":
-            self.compile_make_project(project_path)
-        elif compile_method == "compile_python_project":
-            self.compile_python_project(project_path)
-        elif compile_method == "compile_node_project":
-            self.compile_node_project(project_path)
-        elif compile_method == "compile_java_project":
-            self.compile_java_project(project_path)
-        elif compile_method == "handle_executable":
-            self.handle_executable(project_path)
-        else:
-            self.log("Méthode de compilation inconnue")
+        known_method = True
+        start = time.monotonic()
+        try:
+            if compile_method == "compile_cmake_project":
+                self.compile_cmake_project(project_path)
+            elif compile_method == "compile_make_project":
+                self.compile_make_project(project_path)
+            elif compile_method == "compile_python_project":
+                self.compile_python_project(project_path)
+            elif compile_method == "compile_node_project":
+                self.compile_node_project(project_path)
+            elif compile_method == "compile_java_project":
+                self.compile_java_project(project_path)
+            elif compile_method == "handle_executable":
+                self.handle_executable(project_path)
+            else:
+                self.log("Méthode de compilation inconnue")
+                known_method = False
+        except Exception:
+            self.update_index("record_build", project_path, self.project_info['name'], "failed",
+                              time.monotonic() - start, None)
+            raise
+
+        if known_method:
+            self.update_index("record_build", project_path, self.project_info['name'], "success",
+                              time.monotonic() - start, self.project_info.get('main_executable'))
 
         # Ajouter ici la logique spécifique pour compiler pour Windows, Mac ou Linux
         # en fonction de `target_os`